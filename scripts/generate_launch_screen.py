@@ -5,11 +5,34 @@ Shows the wallet icon centered on a solid background.
 """
 
 from PIL import Image, ImageDraw
+import hashlib
 import os
 
+from png_options import png_save_options
+
+# Sidecar file recording the inputs the current launch images were built from
+CACHE_FILENAME = '.LaunchImage.hash'
+
+def launch_image_filename(scale_name):
+    """Asset catalog filename for a scale ('1x', '2x', '3x')"""
+    if scale_name == '1x':
+        return 'LaunchImage.png'
+    return f'LaunchImage@{scale_name}.png'
+
+def compute_cache_key(icon_path, *settings):
+    """Hash the source icon, this script's rendering code and the generation settings"""
+    with open(icon_path, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8)
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
 def create_launch_screen():
     """Create simple launch screen with centered icon"""
 
+    png_options = png_save_options()
+
     # Launch screen dimensions (we'll create @1x, @2x, @3x)
     # Using a square base that works well centered
     base_size = 400  # Base size for @1x
@@ -17,7 +40,7 @@ def create_launch_screen():
     # Colors matching the app theme
     background_color = "#1A1A1A"  # Dark gray (minimalist theme)
 
-    # Load the app icon
+    # Locate the app icon
     icon_path = os.path.join(
         os.path.dirname(os.path.dirname(__file__)),
         'assets', 'icons', 'app_icon.png'
@@ -27,16 +50,13 @@ def create_launch_screen():
         print(f"❌ Error: App icon not found at {icon_path}")
         return
 
-    # Load icon and resize to appropriate size
-    icon = Image.open(icon_path)
     icon_size = int(base_size * 0.5)  # Icon takes 50% of screen width
-    icon = icon.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
 
-    # Create launch screens for different resolutions
+    # Create launch screens for different resolutions, largest first
     scales = {
-        '1x': 1,
+        '3x': 3,
         '2x': 2,
-        '3x': 3
+        '1x': 1
     }
 
     output_dir = os.path.join(
@@ -44,38 +64,74 @@ def create_launch_screen():
         'ios', 'Runner', 'Assets.xcassets', 'LaunchImage.imageset'
     )
 
-    for scale_name, scale_factor in scales.items():
-        # Calculate dimensions for this scale
-        width = base_size * scale_factor
-        height = base_size * scale_factor
-        icon_scaled_size = icon_size * scale_factor
+    # Skip regeneration when the icon and settings match the last run;
+    # the PNG options are part of the key so a PNG_LEVEL=9 release run rewrites dev output
+    cache_key = compute_cache_key(
+        icon_path, base_size, icon_size, background_color, scales,
+        sorted(png_options.items())
+    )
+    cache_path = os.path.join(output_dir, CACHE_FILENAME)
+    outputs_exist = all(
+        os.path.exists(os.path.join(output_dir, launch_image_filename(scale_name)))
+        for scale_name in scales
+    )
+
+    if outputs_exist and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            if f.read().strip() == cache_key:
+                print(f"✅ Launch screen images are up to date ({cache_key})")
+                print(f"   Location: {output_dir}")
+                return
 
-        # Create image with background
-        img = Image.new('RGB', (width, height), background_color)
+    # Render only the largest scale; smaller scales are downscaled from it
+    max_scale = max(scales.values())
+    full_size = base_size * max_scale
+    icon_full_size = icon_size * max_scale
 
-        # Scale the icon for this resolution
+    # Create image with background
+    full_img = Image.new('RGB', (full_size, full_size), background_color)
+
+    # Scale the full-resolution icon in a single pass
+    with Image.open(icon_path) as icon:
         icon_scaled = icon.resize(
-            (icon_scaled_size, icon_scaled_size),
+            (icon_full_size, icon_full_size),
             Image.Resampling.LANCZOS
         )
 
-        # Center the icon
-        x = (width - icon_scaled_size) // 2
-        y = (height - icon_scaled_size) // 2
+    # Center the icon
+    x = (full_size - icon_full_size) // 2
+    y = (full_size - icon_full_size) // 2
 
-        # Paste icon onto background
-        img.paste(icon_scaled, (x, y))
+    # Paste icon onto background
+    full_img.paste(icon_scaled, (x, y))
+    icon_scaled.close()
 
-        # Save with appropriate filename
-        if scale_name == '1x':
-            filename = 'LaunchImage.png'
+    for scale_name, scale_factor in scales.items():
+        # Calculate dimensions for this scale
+        width = base_size * scale_factor
+        height = base_size * scale_factor
+
+        if scale_factor == max_scale:
+            img = full_img
         else:
-            filename = f'LaunchImage@{scale_name}.png'
+            img = full_img.resize((width, height), Image.Resampling.LANCZOS)
 
+        # Save with appropriate filename
+        filename = launch_image_filename(scale_name)
         output_path = os.path.join(output_dir, filename)
-        img.save(output_path, 'PNG')
+        img.save(output_path, 'PNG', **png_options)
         print(f"✅ Created: {filename} ({width}x{height})")
 
+        # Release each downscaled buffer as soon as it is written
+        if img is not full_img:
+            img.close()
+
+    full_img.close()
+
+    # Record the inputs only after every image was written
+    with open(cache_path, 'w') as f:
+        f.write(cache_key)
+
     print(f"\n✅ Launch screen images created successfully!")
     print(f"   Location: {output_dir}")
     print(f"   Design: Wallet icon centered on dark background")
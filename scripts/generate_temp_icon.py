@@ -7,9 +7,13 @@ This creates a simple, functional icon that can be refined later.
 from PIL import Image, ImageDraw, ImageFont
 import os
 
+from png_options import png_save_options
+
 def create_wallet_icon():
     """Create a simple wallet icon with modern minimalist design"""
 
+    png_options = png_save_options()
+
     # Icon size
     size = 1024
 
@@ -95,7 +99,7 @@ def create_wallet_icon():
         'assets', 'icons', 'app_icon.png'
     )
 
-    img.save(output_path, 'PNG')
+    img.save(output_path, 'PNG', **png_options)
     print(f"✅ Icon created: {output_path}")
     print(f"   Size: {size}x{size} pixels")
     print(f"   This is a temporary icon - you can refine it later!")
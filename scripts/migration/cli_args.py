@@ -0,0 +1,17 @@
+"""
+Command line argument types shared by the migration scripts.
+"""
+
+import argparse
+
+def positive_int(value):
+    """
+    argparse type for options that must be at least 1
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
@@ -27,8 +27,11 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import os
 import sys
+import argparse
 from datetime import datetime
 
+from cli_args import positive_int
+
 # Load environment variables
 load_dotenv('../../.env')
 
@@ -37,11 +40,12 @@ SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_ANON_KEY')
 CSV_FILE = 'notion_expenses.csv'  # Update with your CSV filename
 USER_ID = 'YOUR_USER_ID_HERE'     # Update after creating first user
+BATCH_SIZE = 1000                 # Rows per insert request
 
 # Initialize Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-def fetch_category_mapping():
+def fetch_category_mapping(verbose=False):
     """
     Fetch all categories from Supabase and create Vietnamese name → UUID mapping
     """
@@ -52,13 +56,13 @@ def fetch_category_mapping():
     print(f"✅ Found {len(category_map)} categories")
 
     # Display categories for verification
-    print("\nAvailable categories:")
-    for name_vi in sorted(category_map.keys()):
-        print(f"  - {name_vi}")
+    if verbose:
+        print("\nAvailable categories:")
+        print("\n".join(f"  - {name_vi}" for name_vi in sorted(category_map)))
 
     return category_map
 
-def fetch_type_mapping():
+def fetch_type_mapping(verbose=False):
     """
     Fetch all expense types from Supabase and create Vietnamese name → UUID mapping
     """
@@ -69,9 +73,9 @@ def fetch_type_mapping():
     print(f"✅ Found {len(type_map)} expense types")
 
     # Display types for verification
-    print("\nAvailable expense types:")
-    for name_vi in sorted(type_map.keys()):
-        print(f"  - {name_vi}")
+    if verbose:
+        print("\nAvailable expense types:")
+        print("\n".join(f"  - {name_vi}" for name_vi in sorted(type_map)))
 
     return type_map
 
@@ -112,15 +116,17 @@ def validate_data(df, category_map, type_map):
     if missing_columns:
         errors.append(f"Missing required columns: {', '.join(missing_columns)}")
 
-    # Validate categories
-    invalid_categories = set(df['Category'].unique()) - set(category_map.keys())
+    # Validate categories (missing values count as invalid)
+    invalid_mask = ~df['Category'].isin(set(category_map))
+    invalid_categories = df.loc[invalid_mask, 'Category'].unique().tolist()
     if invalid_categories:
-        errors.append(f"Invalid categories found: {', '.join(invalid_categories)}")
+        errors.append(f"Invalid categories found: {', '.join(str(c) for c in invalid_categories)}")
 
-    # Validate types
-    invalid_types = set(df['Type'].unique()) - set(type_map.keys())
+    # Validate types (missing values count as invalid)
+    invalid_mask = ~df['Type'].isin(set(type_map))
+    invalid_types = df.loc[invalid_mask, 'Type'].unique().tolist()
     if invalid_types:
-        errors.append(f"Invalid expense types found: {', '.join(invalid_types)}")
+        errors.append(f"Invalid expense types found: {', '.join(str(t) for t in invalid_types)}")
 
     if errors:
         print("\n❌ Validation failed:")
@@ -136,37 +142,59 @@ def transform_data(df, category_map, type_map):
     """
     print("\n🔄 Transforming data...")
 
-    expenses = []
-    for _, row in df.iterrows():
-        expense = {
-            'user_id': USER_ID,
-            'category_id': category_map[row['Category']],
-            'type_id': type_map[row['Type']],
-            'description': row['Name'],
-            'amount': float(row['Amount']),
-            'date': row['Date'],
-            'note': row.get('Notes', '') if pd.notna(row.get('Notes')) else None,
-        }
-        expenses.append(expense)
+    # Notes is optional in the export, so fall back to an empty column
+    if 'Notes' in df.columns:
+        notes = df['Notes'].astype(object)
+    else:
+        notes = pd.Series(None, index=df.index, dtype=object)
+
+    # Build Supabase rows, mapping category/type names to UUIDs
+    out = pd.DataFrame({
+        'user_id': USER_ID,
+        'category_id': df['Category'].map(category_map),
+        'type_id': df['Type'].map(type_map),
+        'description': df['Name'],
+        'amount': df['Amount'].astype(float),
+        'date': df['Date'],
+        'note': notes.where(notes.notna(), None),
+    })
+    expenses = out.to_dict('records')
 
     print(f"✅ Transformed {len(expenses)} expenses")
     return expenses
 
-def migrate_expenses(expenses):
+def is_payload_too_large(error):
+    """
+    Check whether an insert failed because the request body was too big (HTTP 413)
+    """
+    return str(getattr(error, 'code', '')) == '413'
+
+def migrate_expenses(expenses, batch_size=BATCH_SIZE):
     """
     Batch insert expenses into Supabase
+    Halves the batch size and retries when a batch is rejected as too large
     """
     print(f"\n📤 Migrating {len(expenses)} expenses to Supabase...")
 
-    # Insert in batches of 100 to avoid API limits
-    batch_size = 100
     total_inserted = 0
+    batch_number = 0
+    i = 0
 
-    for i in range(0, len(expenses), batch_size):
+    while i < len(expenses):
         batch = expenses[i:i + batch_size]
-        response = supabase.table('expenses').insert(batch).execute()
+        try:
+            response = supabase.table('expenses').insert(batch).execute()
+        except Exception as e:
+            if not is_payload_too_large(e) or batch_size == 1:
+                raise
+            batch_size = max(batch_size // 2, 1)
+            print(f"   Batch too large, retrying with batch size {batch_size}")
+            continue
+
+        batch_number += 1
         total_inserted += len(response.data)
-        print(f"   Inserted batch {i//batch_size + 1}: {len(response.data)} rows")
+        print(f"   Inserted batch {batch_number}: {len(response.data)} rows")
+        i += len(batch)
 
     print(f"✅ Successfully migrated {total_inserted} expenses")
     return total_inserted
@@ -195,6 +223,13 @@ def main():
     """
     Main migration workflow
     """
+    parser = argparse.ArgumentParser(description='Migrate Notion expenses to Supabase')
+    parser.add_argument('--batch-size', type=positive_int, default=BATCH_SIZE,
+                        help=f'Rows per insert request (default: {BATCH_SIZE})')
+    parser.add_argument('--verbose', action='store_true',
+                        help='List every category and expense type fetched from Supabase')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Notion → Supabase Migration")
     print("=" * 60)
@@ -208,8 +243,8 @@ def main():
         sys.exit(1)
 
     # Step 1: Fetch mappings from Supabase
-    category_map = fetch_category_mapping()
-    type_map = fetch_type_mapping()
+    category_map = fetch_category_mapping(args.verbose)
+    type_map = fetch_type_mapping(args.verbose)
 
     # Step 2: Load CSV
     df = load_csv(CSV_FILE)
@@ -229,7 +264,7 @@ def main():
         sys.exit(0)
 
     # Step 6: Migrate
-    total_inserted = migrate_expenses(expenses)
+    total_inserted = migrate_expenses(expenses, args.batch_size)
 
     # Step 7: Verify
     verify_migration(total_inserted)
@@ -7,10 +7,15 @@ It handles Notion-specific formatting including URLs, comma separators, and extr
 
 Prerequisites:
 - Python 3.8+
-- pip install pandas supabase-py python-dotenv
+- pip install pandas supabase-py python-dotenv httpx orjson
+
+Optional (for --direct-db):
+- pip install "psycopg[binary]"
+- Set SUPABASE_DB_URL in .env to the Postgres connection pooler URL
 
 Usage:
 python notion_to_supabase_enhanced.py --csv <path_to_csv> --user-id <your_uuid>
+python notion_to_supabase_enhanced.py --csv <path_to_csv> --user-id <your_uuid> --direct-db
 """
 
 import pandas as pd
@@ -19,8 +24,12 @@ from dotenv import load_dotenv
 import os
 import sys
 import argparse
-import re
-from datetime import datetime
+import asyncio
+import httpx
+import orjson
+from uuid import UUID
+
+from cli_args import positive_int
 
 # Load environment variables from project root
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -30,10 +39,27 @@ load_dotenv(env_path)
 # Configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')  # Use service role for admin operations
+SUPABASE_DB_URL = os.getenv('SUPABASE_DB_URL')  # Direct Postgres URL, only needed for --direct-db
+DEFAULT_BATCH_SIZE = 1000  # Rows per insert request
+DEFAULT_CONCURRENCY = 8    # Insert requests in flight at once
+DEFAULT_CHUNK_SIZE = 50_000  # CSV rows cleaned and migrated at a time
 
 # Initialize Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Notion export columns used by the migration; everything else is skipped on read
+NOTION_COLUMNS = ['Name', 'Amount', 'Category', 'Type', 'Date', 'Notes']
+
+# Columns written by COPY, in CSV order
+COPY_COLUMNS = ['user_id', 'category_id', 'type_id', 'description', 'amount', 'date', 'note']
+
+# Mapping of Notion category spellings to Supabase canonical names
+CATEGORY_MAPPING = {
+    'Quà vặt': 'Quà vật',      # Common Vietnamese variant
+    'Sức khoẻ': 'Sức khỏe',    # Common Vietnamese variant
+    'Biếu gia đình': 'Biểu gia đình',  # Spelling variant
+}
+
 def clean_notion_text(text):
     """
     Remove Notion URLs and clean text
@@ -50,61 +76,65 @@ def clean_notion_text(text):
 
     return text
 
-def normalize_category_name(category):
+def clean_notion_column(series):
     """
-    Normalize category names to handle spelling variations
-    Maps Notion variations to Supabase canonical names
+    Vectorized clean_notion_text for a whole column
+    Missing values come back as None
     """
-    if pd.isna(category):
-        return None
-    
-    # Mapping of Notion spellings to Supabase spellings
-    category_mapping = {
-        'Quà vặt': 'Quà vật',      # Common Vietnamese variant
-        'Sức khoẻ': 'Sức khỏe',    # Common Vietnamese variant
-        'Biếu gia đình': 'Biểu gia đình',  # Spelling variant
-    }
-    
-    return category_mapping.get(category, category)
+    cleaned = series.astype('string').str.strip()
+
+    # Most cells have no Notion URL, so only split the ones that do
+    has_url = cleaned.str.contains('(', regex=False, na=False)
+    if has_url.any():
+        cleaned.loc[has_url] = cleaned[has_url].str.split('(', n=1).str[0].str.strip()
+
+    return cleaned.astype(object).where(cleaned.notna(), None)
 
-def clean_amount(amount):
+def clean_notion_categories(series, mapping=None):
     """
-    Remove commas and convert to float
-    Example: "50,000" → 50000.0
+    Clean a low-cardinality column by cleaning each distinct value once
+    Applies an optional spelling mapping in the same lookup
     """
-    if pd.isna(amount):
-        return 0.0
+    mapping = mapping or {}
+    lookup = {}
+    for raw in series.dropna().unique():
+        text = clean_notion_text(raw)
+        lookup[raw] = mapping.get(text, text)
 
-    # Convert to string and remove commas
-    amount_str = str(amount).replace(',', '')
+    cleaned = series.map(lookup)
+    return cleaned.astype(object).where(cleaned.notna(), None)
 
-    try:
-        return float(amount_str)
-    except ValueError:
-        print(f"⚠️  Warning: Could not parse amount: {amount}")
-        return 0.0
+def parse_amounts(series):
+    """
+    Remove commas and convert a column of amounts to float: "50,000" → 50000.0
+    Missing or unparseable amounts become 0.0
+    """
+    raw = series.astype('string').str.replace(',', '', regex=False)
+    amounts = pd.to_numeric(raw, errors='coerce')
+
+    invalid = amounts.isna() & raw.notna()
+    if invalid.any():
+        print(f"⚠️  Warning: Could not parse {int(invalid.sum())} amount(s): {series[invalid].tolist()[:20]}")
 
-def parse_notion_date(date_str):
+    return amounts.fillna(0.0).astype(float)
+
+def parse_notion_dates(series):
     """
-    Parse Notion date format: "January 1, 2025" → "2025-01-01"
+    Parse a column of Notion dates: "January 1, 2025" → "2025-01-01"
+    Falls back to ISO format ("2025-01-01"); unparseable dates become None
     """
-    if pd.isna(date_str):
-        return None
+    notion_dates = pd.to_datetime(series, format="%B %d, %Y", errors='coerce')
+    iso_dates = pd.to_datetime(series, format="%Y-%m-%d", errors='coerce')
+    dates = notion_dates.fillna(iso_dates)
 
-    try:
-        # Try parsing Notion format: "January 1, 2025"
-        date_obj = datetime.strptime(str(date_str), "%B %d, %Y")
-        return date_obj.strftime("%Y-%m-%d")
-    except ValueError:
-        try:
-            # Try ISO format: "2025-01-01"
-            date_obj = datetime.strptime(str(date_str), "%Y-%m-%d")
-            return date_obj.strftime("%Y-%m-%d")
-        except ValueError:
-            print(f"⚠️  Warning: Could not parse date: {date_str}")
-            return None
+    invalid_count = int((dates.isna() & series.notna()).sum())
+    if invalid_count > 0:
+        print(f"⚠️  Warning: Could not parse {invalid_count} date(s)")
 
-def fetch_category_mapping():
+    formatted = dates.dt.strftime("%Y-%m-%d")
+    return formatted.astype(object).where(dates.notna(), None)
+
+def fetch_category_mapping(verbose=False):
     """
     Fetch all categories from Supabase and create Vietnamese name → UUID mapping
     """
@@ -115,13 +145,13 @@ def fetch_category_mapping():
     print(f"✅ Found {len(category_map)} categories")
 
     # Display categories for verification
-    print("\n📋 Available categories:")
-    for name_vi in sorted(category_map.keys()):
-        print(f"  • {name_vi}")
+    if verbose:
+        print("\n📋 Available categories:")
+        print("\n".join(f"  • {name_vi}" for name_vi in sorted(category_map)))
 
     return category_map
 
-def fetch_type_mapping():
+def fetch_type_mapping(verbose=False):
     """
     Fetch all expense types from Supabase and create Vietnamese name → UUID mapping
     """
@@ -132,15 +162,24 @@ def fetch_type_mapping():
     print(f"✅ Found {len(type_map)} expense types")
 
     # Display types for verification
-    print("\n📋 Available expense types:")
-    for name_vi in sorted(type_map.keys()):
-        print(f"  • {name_vi}")
+    if verbose:
+        print("\n📋 Available expense types:")
+        print("\n".join(f"  • {name_vi}" for name_vi in sorted(type_map)))
 
     return type_map
 
-def load_and_clean_csv(filename):
+def read_notion_csv(filename, chunk_size):
+    """
+    Read the Notion columns we migrate as strings, chunk_size rows at a time
+    Uses pandas' C engine since the pyarrow engine cannot read in chunks
+    """
+    return pd.read_csv(filename, usecols=NOTION_COLUMNS, dtype='string',
+                       chunksize=chunk_size, low_memory=False)
+
+def load_and_clean_csv(filename, chunk_size=DEFAULT_CHUNK_SIZE):
     """
     Load Notion CSV export and clean the data
+    Yields one cleaned DataFrame per chunk so only chunk_size rows are held in memory
     """
     print(f"\n📂 Loading CSV file: {filename}")
 
@@ -149,26 +188,40 @@ def load_and_clean_csv(filename):
         print(f"   Expected path: {os.path.abspath(filename)}")
         sys.exit(1)
 
-    # Read CSV
-    df = pd.read_csv(filename)
-    print(f"✅ Loaded {len(df)} rows from CSV")
+    for chunk_number, df in enumerate(read_notion_csv(filename, chunk_size), start=1):
+        print(f"\n📦 Chunk {chunk_number}: loaded {len(df)} rows from CSV")
+
+        if chunk_number == 1:
+            # Display the columns used for migration
+            print(f"\n📊 CSV columns used ({len(df.columns)}):")
+            for col in df.columns:
+                print(f"  • {col}")
 
-    # Display original columns
-    print(f"\n📊 Original CSV columns ({len(df.columns)}):")
-    for col in df.columns:
-        print(f"  • {col}")
+        cleaned_df = clean_notion_data(df)
 
-    # Clean and transform data
+        if chunk_number == 1:
+            # Show sample of cleaned data
+            print("\n📝 Sample of cleaned data (first 3 rows):")
+            print(cleaned_df.head(3).to_string())
+
+        yield cleaned_df
+
+def clean_notion_data(df):
+    """
+    Clean one chunk of raw Notion rows into the migration columns
+    """
     print("\n🧹 Cleaning data...")
 
-    # Extract and clean the columns we need
+    # Empty notes are stored as NULL
+    note = clean_notion_column(df['Notes'])
+
     cleaned_df = pd.DataFrame({
-        'description': df['Name'].apply(clean_notion_text),
-        'amount': df['Amount'].apply(clean_amount),
-        'category': df['Category'].apply(clean_notion_text).apply(normalize_category_name),
-        'type': df['Type'].apply(clean_notion_text),
-        'date': df['Date'].apply(parse_notion_date),
-        'note': df['Notes'].apply(lambda x: clean_notion_text(x) if pd.notna(x) and str(x).strip() else None)
+        'description': clean_notion_column(df['Name']),
+        'amount': parse_amounts(df['Amount']),
+        'category': clean_notion_categories(df['Category'], CATEGORY_MAPPING),
+        'type': clean_notion_categories(df['Type']),
+        'date': parse_notion_dates(df['Date']),
+        'note': note.where(note != '', None)
     })
 
     # Remove rows with invalid dates
@@ -181,43 +234,46 @@ def load_and_clean_csv(filename):
 
     print(f"✅ Cleaned {len(cleaned_df)} valid expenses")
 
-    # Show sample of cleaned data
-    print("\n📝 Sample of cleaned data (first 3 rows):")
-    print(cleaned_df.head(3).to_string())
-
     return cleaned_df
 
-def validate_data(df, category_map, type_map):
+def validate_data(df, category_map, type_map, strict=True):
     """
     Validate that all categories and types in CSV exist in Supabase
+    Exits on invalid values when strict; otherwise only warns, and transform_data skips those rows
     """
     print("\n🔍 Validating data...")
 
     errors = []
     warnings = []
 
+    # Count rows per category/type once; the index doubles as the unique values
+    category_counts = df['category'].value_counts(dropna=False)
+    type_counts = df['type'].value_counts(dropna=False)
+    category_keys = set(category_map)
+    type_keys = set(type_map)
+
     # Check for missing categories
-    unique_categories = df['category'].unique()
     # Filter out None values before checking
-    invalid_categories = set(c for c in unique_categories if c is not None) - set(category_map.keys())
+    invalid_mask = ~df['category'].isin(category_keys)
+    invalid_categories = df.loc[invalid_mask, 'category'].dropna().unique().tolist()
 
     if invalid_categories:
         errors.append(f"Invalid categories found: {', '.join(str(c) for c in invalid_categories)}")
         print(f"\n❌ Categories not in database:")
         for cat in invalid_categories:
-            count = len(df[df['category'] == cat])
+            count = int(category_counts.get(cat, 0))
             print(f"  • {cat} ({count} expenses)")
 
     # Check for missing types
-    unique_types = df['type'].unique()
     # Filter out None values before checking
-    invalid_types = set(t for t in unique_types if t is not None) - set(type_map.keys())
+    invalid_mask = ~df['type'].isin(type_keys)
+    invalid_types = df.loc[invalid_mask, 'type'].dropna().unique().tolist()
 
     if invalid_types:
         errors.append(f"Invalid expense types found: {', '.join(str(t) for t in invalid_types)}")
         print(f"\n❌ Types not in database:")
         for t in invalid_types:
-            count = len(df[df['type'] == t])
+            count = int(type_counts.get(t, 0))
             print(f"  • {t} ({count} expenses)")
 
     # Check for zero amounts
@@ -225,25 +281,30 @@ def validate_data(df, category_map, type_map):
     if zero_amounts > 0:
         warnings.append(f"{zero_amounts} expenses have zero amount")
 
-    if errors:
+    if errors and strict:
         print("\n❌ Validation failed:")
         for error in errors:
             print(f"   • {error}")
         print("\n💡 Tip: Make sure category/type names match exactly (case-sensitive)")
+        print("   Run with --verbose to list the names available in Supabase")
         sys.exit(1)
 
+    # Non-strict validation reports invalid values as warnings
+    warnings = errors + warnings
+
     if warnings:
         print("\n⚠️  Warnings:")
         for warning in warnings:
             print(f"   • {warning}")
 
-    print("✅ All data validated successfully")
+    if not errors:
+        print("✅ All data validated successfully")
 
     # Show statistics
     print("\n📊 Data statistics:")
     print(f"  • Total expenses: {len(df)}")
-    print(f"  • Unique categories: {len(unique_categories)}")
-    print(f"  • Unique types: {len(unique_types)}")
+    print(f"  • Unique categories: {len(category_counts)}")
+    print(f"  • Unique types: {len(type_counts)}")
     print(f"  • Date range: {df['date'].min()} to {df['date'].max()}")
     print(f"  • Amount range: ₫{df['amount'].min():,.0f} to ₫{df['amount'].max():,.0f}")
     print(f"  • Total amount: ₫{df['amount'].sum():,.0f}")
@@ -251,71 +312,167 @@ def validate_data(df, category_map, type_map):
 def transform_data(df, category_map, type_map, user_id):
     """
     Transform cleaned CSV data to Supabase schema format
+    Returns a DataFrame with one row per expense, columns in COPY_COLUMNS order
     """
     print("\n🔄 Transforming data for Supabase...")
 
-    expenses = []
-    skipped = 0
-
-    for idx, row in df.iterrows():
-        # Skip if category or type is invalid
-        if row['category'] not in category_map:
-            skipped += 1
-            continue
-        if row['type'] not in type_map:
-            skipped += 1
-            continue
-
-        expense = {
-            'user_id': user_id,
-            'category_id': category_map[row['category']],
-            'type_id': type_map[row['type']],
-            'description': row['description'],
-            'amount': row['amount'],
-            'date': row['date'],
-            'note': row['note']
-        }
-        expenses.append(expense)
+    # Skip rows whose category or type has no match in Supabase
+    mask = df['category'].isin(list(category_map)) & df['type'].isin(list(type_map))
+    skipped = int((~mask).sum())
+    valid = df[mask]
+
+    # Build Supabase rows, mapping category/type names to UUIDs
+    notes = valid['note'].astype(object)
+    out = pd.DataFrame({
+        'user_id': user_id,
+        'category_id': valid['category'].map(category_map),
+        'type_id': valid['type'].map(type_map),
+        'description': valid['description'],
+        'amount': valid['amount'].astype(float),
+        'date': valid['date'],
+        'note': notes.where(notes.notna(), None),
+    })
 
     if skipped > 0:
         print(f"⚠️  Skipped {skipped} rows due to invalid category/type")
 
-    print(f"✅ Transformed {len(expenses)} expenses ready for migration")
-    return expenses
+    print(f"✅ Transformed {len(out)} expenses ready for migration")
+    return out
+
+async def upload_batch(client, batch, semaphore, start=0):
+    """
+    POST one batch to the Supabase REST API
+    Returns (rows inserted, failures); each failure is (first row, end row, error) for a rejected range,
+    with row offsets counted from `start`
+    Splits the batch in half and retries when it is rejected as too large (HTTP 413);
+    the halves succeed or fail independently
+    """
+    async with semaphore:
+        response = await client.post('/rest/v1/expenses', content=orjson.dumps(batch))
+
+    if response.status_code == 413 and len(batch) > 1:
+        middle = len(batch) // 2
+        halves = [(start, batch[:middle]), (start + middle, batch[middle:])]
+        results = await asyncio.gather(
+            *(upload_batch(client, half, semaphore, half_start) for half_start, half in halves),
+            return_exceptions=True,
+        )
+
+        inserted = 0
+        failures = []
+        for (half_start, half), result in zip(halves, results):
+            if isinstance(result, Exception):
+                failures.append((half_start, half_start + len(half), str(result)))
+            else:
+                inserted += result[0]
+                failures.extend(result[1])
+        return inserted, failures
+
+    if response.is_error:
+        return 0, [(start, start + len(batch), f"HTTP {response.status_code}: {response.text}")]
+
+    return len(batch), []
+
+async def upload_batches(batches, concurrency):
+    """
+    Upload all batches with at most `concurrency` requests in flight
+    Returns one result per batch, in order: upload_batch's (rows inserted, failures) or the exception raised
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {
+        'apikey': SUPABASE_KEY,
+        'Authorization': f'Bearer {SUPABASE_KEY}',
+        'Content-Type': 'application/json',
+        'Prefer': 'return=minimal',  # Don't send the inserted rows back
+    }
+
+    async with httpx.AsyncClient(base_url=SUPABASE_URL, headers=headers, timeout=60.0) as client:
+        tasks = [asyncio.create_task(upload_batch(client, batch, semaphore)) for batch in batches]
+
+        for finished, task in enumerate(asyncio.as_completed(tasks), start=1):
+            try:
+                await task
+            except Exception:
+                pass  # Reported per batch by the caller
 
-def migrate_expenses(expenses):
+            # Progress indicator
+            progress = finished / len(tasks) * 100
+            print(f"  [{'=' * int(progress / 5)}{' ' * (20 - int(progress / 5))}] {progress:.0f}% - {finished}/{len(tasks)} batches")
+
+    return [task.exception() or task.result() for task in tasks]
+
+def migrate_expenses(expenses, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY):
     """
-    Batch insert expenses into Supabase
+    Batch insert expenses (the DataFrame from transform_data) into Supabase,
+    uploading several batches concurrently
     """
     print(f"\n📤 Migrating {len(expenses)} expenses to Supabase...")
 
-    # Insert in batches of 100 to avoid API limits
-    batch_size = 100
+    records = expenses.to_dict('records')
+    batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+    results = asyncio.run(upload_batches(batches, concurrency))
+
     total_inserted = 0
     errors = []
 
-    for i in range(0, len(expenses), batch_size):
-        batch = expenses[i:i + batch_size]
-        try:
-            response = supabase.table('expenses').insert(batch).execute()
-            total_inserted += len(response.data)
+    for batch_number, (batch, result) in enumerate(zip(batches, results), start=1):
+        if isinstance(result, Exception):
+            errors.append(f"Batch {batch_number}: {str(result)}")
+            continue
 
-            # Progress indicator
-            progress = (i + len(batch)) / len(expenses) * 100
-            print(f"  [{'=' * int(progress / 5)}{' ' * (20 - int(progress / 5))}] {progress:.0f}% - Batch {i//batch_size + 1}")
+        inserted, failures = result
+        total_inserted += inserted
 
-        except Exception as e:
-            errors.append(f"Batch {i//batch_size + 1}: {str(e)}")
-            print(f"  ❌ Error in batch {i//batch_size + 1}: {str(e)}")
+        # Report only the rows the server rejected; the rest of the batch was committed
+        for first, end, error in failures:
+            if first == 0 and end == len(batch):
+                errors.append(f"Batch {batch_number}: {error}")
+            else:
+                errors.append(f"Batch {batch_number}, rows {first + 1}-{end}: {error}")
 
     if errors:
-        print(f"\n⚠️  {len(errors)} batch(es) failed:")
+        print(f"\n⚠️  {len(errors)} upload(s) failed:")
         for error in errors:
             print(f"  • {error}")
 
     print(f"\n✅ Successfully migrated {total_inserted} expenses")
     return total_inserted
 
+def copy_expenses(expenses):
+    """
+    Bulk load expenses with PostgreSQL COPY over a direct database connection
+    Skips the REST API entirely; requires psycopg and SUPABASE_DB_URL
+    """
+    try:
+        import psycopg
+    except ImportError:
+        print("\n❌ Error: --direct-db requires psycopg")
+        print('   Install it with: pip install "psycopg[binary]"')
+        sys.exit(1)
+
+    if not SUPABASE_DB_URL:
+        print("\n❌ Error: SUPABASE_DB_URL is not set")
+        print("   Add the Postgres connection pooler URL to your .env file")
+        sys.exit(1)
+
+    print(f"\n📤 Copying {len(expenses)} expenses into Postgres...")
+
+    # Stream rows straight from the frame; write_row sends None as NULL and keeps '' as ''
+    copy_sql = f"COPY expenses ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+    try:
+        with psycopg.connect(SUPABASE_DB_URL) as conn, conn.cursor() as cur:
+            with cur.copy(copy_sql) as copy:
+                for row in expenses[COPY_COLUMNS].itertuples(index=False, name=None):
+                    copy.write_row(row)
+    except psycopg.Error as e:
+        # COPY runs in one transaction, so nothing from this chunk was stored
+        print("\n⚠️  COPY failed, no expenses from this chunk were migrated:")
+        print(f"  • {str(e).strip()}")
+        return 0
+
+    print(f"\n✅ Successfully migrated {len(expenses)} expenses")
+    return len(expenses)
+
 def verify_migration(expected_count, user_id):
     """
     Verify that all expenses were migrated correctly
@@ -344,6 +501,16 @@ def main():
     parser = argparse.ArgumentParser(description='Migrate Notion expenses to Supabase')
     parser.add_argument('--csv', required=True, help='Path to Notion CSV export file')
     parser.add_argument('--user-id', required=True, help='Supabase user UUID')
+    parser.add_argument('--batch-size', type=positive_int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows per insert request (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--concurrency', type=positive_int, default=DEFAULT_CONCURRENCY,
+                        help=f'Insert requests in flight at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--direct-db', action='store_true',
+                        help='Load with PostgreSQL COPY via SUPABASE_DB_URL instead of the REST API')
+    parser.add_argument('--chunk-size', type=positive_int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'CSV rows cleaned and migrated at a time (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--verbose', action='store_true',
+                        help='List every category and expense type fetched from Supabase')
     args = parser.parse_args()
 
     print("=" * 70)
@@ -352,38 +519,52 @@ def main():
     print(f"\n📁 CSV File: {args.csv}")
     print(f"👤 User ID:  {args.user_id}")
 
-    # Validate UUID format
-    uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
-    if not uuid_pattern.match(args.user_id):
+    # Validate UUID format and normalize to lowercase hyphenated form
+    try:
+        args.user_id = str(UUID(args.user_id))
+    except ValueError:
         print("\n❌ Error: Invalid UUID format")
         print("   Expected format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx")
         sys.exit(1)
 
     # Step 1: Fetch mappings from Supabase
-    category_map = fetch_category_mapping()
-    type_map = fetch_type_mapping()
+    category_map = fetch_category_mapping(args.verbose)
+    type_map = fetch_type_mapping(args.verbose)
 
-    # Step 2: Load and clean CSV
-    df = load_and_clean_csv(args.csv)
-
-    # Step 3: Validate data
-    validate_data(df, category_map, type_map)
-
-    # Step 4: Transform data
-    expenses = transform_data(df, category_map, type_map, args.user_id)
-
-    # Step 5: Confirm before migration
-    print("\n" + "=" * 70)
-    print(f"⚠️  Ready to migrate {len(expenses)} expenses to Supabase")
-    print("=" * 70)
-    confirm = input("\n   Continue with migration? (yes/no): ")
-
-    if confirm.lower() != 'yes':
-        print("\n❌ Migration cancelled by user")
-        sys.exit(0)
+    # Steps 2-6 run once per CSV chunk, so memory stays bounded by the chunk size
+    total_inserted = 0
+    confirmed = False
 
-    # Step 6: Migrate
-    total_inserted = migrate_expenses(expenses)
+    # Step 2: Load and clean CSV
+    for df in load_and_clean_csv(args.csv, args.chunk_size):
+        if df.empty:
+            continue  # Every row in this chunk was dropped during cleaning
+
+        # Step 3: Validate data (only the first chunk migrated can abort the migration)
+        validate_data(df, category_map, type_map, strict=not confirmed)
+
+        # Step 4: Transform data
+        expenses = transform_data(df, category_map, type_map, args.user_id)
+
+        # Step 5: Confirm before migration
+        if not confirmed:
+            print("\n" + "=" * 70)
+            print(f"⚠️  Ready to migrate {len(expenses)} expenses to Supabase")
+            print(f"   Any further chunks of up to {args.chunk_size} rows follow without asking again")
+            print("=" * 70)
+            confirm = input("\n   Continue with migration? (yes/no): ")
+
+            if confirm.lower() != 'yes':
+                print("\n❌ Migration cancelled by user")
+                sys.exit(0)
+
+            confirmed = True
+
+        # Step 6: Migrate
+        if args.direct_db:
+            total_inserted += copy_expenses(expenses)
+        else:
+            total_inserted += migrate_expenses(expenses, args.batch_size, args.concurrency)
 
     # Step 7: Verify
     verify_migration(total_inserted, args.user_id)
@@ -0,0 +1,28 @@
+"""
+PNG encoder settings shared by the image generator scripts.
+
+Defaults to fast compression (level 1, no optimize) for development runs.
+For release/CI builds of the committed assets set PNG_LEVEL=9, which also
+turns on optimize unless PNG_OPTIMIZE=0.
+"""
+
+import os
+import sys
+
+DEFAULT_PNG_LEVEL = 1
+
+def png_save_options():
+    """Image.save keyword arguments from the PNG_LEVEL and PNG_OPTIMIZE env vars"""
+    raw_level = os.environ.get('PNG_LEVEL', str(DEFAULT_PNG_LEVEL))
+    if not raw_level.isdigit() or not 0 <= int(raw_level) <= 9:
+        print(f"❌ Error: PNG_LEVEL must be an integer from 0 to 9, got '{raw_level}'")
+        sys.exit(1)
+    level = int(raw_level)
+
+    # Optimize forces level 9 in Pillow, so it defaults on only at that level
+    raw_optimize = os.environ.get('PNG_OPTIMIZE', '1' if level == 9 else '0')
+    if raw_optimize not in ('0', '1'):
+        print(f"❌ Error: PNG_OPTIMIZE must be 0 or 1, got '{raw_optimize}'")
+        sys.exit(1)
+
+    return {'compress_level': level, 'optimize': raw_optimize == '1'}